@@ -1,16 +1,43 @@
 # legacy_enterprise.py
-import json, math, hashlib, time
+import json, hashlib, time
+import ijson
+import numpy as np
+from legacy_kernels import compound
+
+def _iter_amts(raw_data):
+    # Stream each item's amt without building the item dicts. Like iterating
+    # json.loads(raw_data) and reading item['amt']: a non-array document, a
+    # non-map item or a non-numeric amt raises TypeError, a map without amt
+    # raises KeyError and the last amt key wins.
+    # ijson wants bytes; str input is deprecated and re-encoded on the fly
+    if isinstance(raw_data, str): raw_data = raw_data.encode()
+    events = ijson.parse(raw_data, use_float=True)
+    # Only array elements may match the 'item' prefix below: a top-level
+    # {"item": ...} map would produce the same prefix for its key
+    first = next(events)
+    if first[:2] != ('', 'start_array'):
+        raise TypeError(f"ledger must be a JSON array, got {first[1]}")
+    amt = None
+    for prefix, event, value in events:
+        if prefix == 'item':
+            if event == 'start_map':
+                amt = None
+            elif event == 'end_map':
+                if amt is None: raise KeyError('amt')
+                yield amt
+            elif event != 'map_key':
+                raise TypeError(f"ledger items must be objects, got {event}")
+        elif prefix == 'item.amt':
+            if event not in ('number', 'boolean'):
+                raise TypeError(f"amt must be a number, got {event}")
+            amt = value
 
 def process_monolith(raw_data):
-    # 1. Parsing
-    items = json.loads(raw_data)
+    # 1. Parsing (stream just the amounts; the item dicts are never built)
+    amts = np.fromiter(_iter_amts(raw_data), dtype=np.float64)
     
     # 2. Math (The Bottleneck)
-    total = 0.0
-    for item in items:
-        val = item['amt']
-        for _ in range(100): val = math.sqrt(val * val + 0.01)
-        total += val
+    _, total = compound(amts)
         
     # 3. Security
     payload = f"TOTAL:{total}".encode()
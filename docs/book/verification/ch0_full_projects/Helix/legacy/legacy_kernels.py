@@ -0,0 +1,88 @@
+# legacy_kernels.py
+# Shared sqrt-chain kernels for the Helix legacy vessels
+import math, importlib.util
+import numpy as np
+
+# Importing numba (~0.35 s) and loading even a disk-cached kernel on its first
+# call (~0.25 s) is paid again by every fresh process, which dwarfs the NumPy
+# path on small ledgers. numba is therefore only imported once a batch has at
+# least JIT_MIN_ROWS rows. Measured per fresh process, the NumPy path still won
+# at 1M rows and broke even near 4M on one core; prange lowers that with more
+# cores. Both paths round identically, so totals and hashes do not depend on
+# which one ran.
+HAVE_NUMBA = importlib.util.find_spec("numba") is not None
+JIT_MIN_ROWS = 2_000_000
+
+prange = range  # rebound to numba.prange when the first kernel is compiled
+_jitted = {}
+
+def _jit(loop):
+    # Rows are independent, so prange splits the sqrt chains across threads
+    # (NUMBA_NUM_THREADS). cache=True keeps the compiled kernel on disk
+    # (relocate with NUMBA_CACHE_DIR).
+    global prange
+    kernel = _jitted.get(loop)
+    if kernel is None:
+        from numba import njit, prange
+        kernel = _jitted[loop] = njit(parallel=True, cache=True, boundscheck=False)(loop)
+    return kernel
+
+def _serial_total(out):
+    # cumsum adds left to right like the original loops; ndarray.sum is pairwise
+    return float(np.cumsum(out)[-1]) if out.size else 0.0
+
+def _compound_vec(amts):
+    # NumPy path: each step is one in-place ufunc pass over every row
+    out = amts.copy()
+    for _ in range(100):
+        np.multiply(out, out, out=out)
+        out += 0.01
+        np.sqrt(out, out=out)
+    return out, _serial_total(out)
+
+def _compound_loop(amts):
+    # 100-step sqrt(v*v + 0.01) chain per amount
+    out = np.empty_like(amts)
+    for i in prange(amts.shape[0]):
+        v = amts[i]
+        for _ in range(100): v = math.sqrt(v * v + 0.01)
+        out[i] = v
+    # Serial left-to-right sum: the total is hashed/signed, so it must not
+    # depend on how the rows were split across threads
+    tot = 0.0
+    for i in range(out.shape[0]):
+        tot += out[i]
+    return out, tot
+
+def _vortex_vec(vals):
+    out = np.sqrt(vals * vals + 0.5)
+    for _ in range(100):
+        out += 0.01
+        np.sqrt(out, out=out)
+    return out, _serial_total(out)
+
+def _vortex_loop(vals):
+    # Batched legacy_vortex.heavy_calculation
+    out = np.empty_like(vals)
+    for i in prange(vals.shape[0]):
+        res = math.sqrt(vals[i] * vals[i] + 0.5)
+        for _ in range(100): res = math.sqrt(res + 0.01)
+        out[i] = res
+    tot = 0.0
+    for i in range(out.shape[0]):
+        tot += out[i]
+    return out, tot
+
+def _use_jit(arr):
+    return HAVE_NUMBA and arr.shape[0] >= JIT_MIN_ROWS
+
+def compound(amts):
+    """Run the sqrt(v*v + 0.01) chain over a float64 array.
+
+    Returns the compounded array and its left-to-right total.
+    """
+    return (_jit(_compound_loop) if _use_jit(amts) else _compound_vec)(amts)
+
+def compound_vortex(vals):
+    """Run heavy_calculation over a float64 array; same return as compound."""
+    return (_jit(_vortex_loop) if _use_jit(vals) else _vortex_vec)(vals)
@@ -1,30 +1,32 @@
 # legacy_settlement.py
-import time, json, hashlib, math, os
+import time, json, hashlib, os
+import numpy as np
+import orjson
+from legacy_kernels import compound
 
 def process_ledger(raw_csv):
     start = time.time()
     
-    # 1. Parsing
-    records = []
-    for line in raw_csv.strip().split("\n"):
-        parts = line.split(",")
-        if len(parts) == 3:
-            records.append({"id": parts[0], "amt": float(parts[1]), "cur": parts[2]})
+    # 1. Parsing: keep only 3-field rows (blank/short/long lines are skipped
+    # as before), then split fields and convert amounts in one C-level pass
+    lines = [line for line in raw_csv.strip().split("\n") if line.count(",") == 2]
+    table = np.loadtxt(lines, delimiter=",", dtype=str, comments=None, ndmin=2) if lines else np.empty((0, 3), dtype=str)
+    amts = table[:, 1].astype(np.float64)
     
     # 2. Math
-    total = 0.0
-    for r in records:
-        val = r["amt"]
-        for _ in range(100): val = math.sqrt(val * val + 0.01)
-        r["compounded"] = val
-        total += val
+    compounded, total = compound(amts)
+    records = [{"amt": a, "compounded": v, "cur": c, "id": i}
+               for i, a, c, v in zip(table[:, 0].tolist(), amts.tolist(), table[:, 2].tolist(), compounded.tolist())]
         
-    # 3. Crypto
-    payload = json.dumps(records, sort_keys=True)
-    sig = hashlib.sha256(payload.encode()).hexdigest()
+    # 3. Crypto: OPT_SORT_KEYS keeps the signed bytes canonical whatever order
+    # the record keys are built in (orjson returns bytes, no .encode() copy)
+    payload = orjson.dumps(records, option=orjson.OPT_SORT_KEYS)
+    sig = hashlib.sha256(payload).hexdigest()
     
     # 4. OS/Reporting
-    os.system("touch audit.log && chmod 600 audit.log")
+    fd = os.open("audit.log", os.O_WRONLY | os.O_CREAT | os.O_CLOEXEC, 0o600)
+    os.fchmod(fd, 0o600)  # open() only applies the mode on creation
+    os.close(fd)
     report = "Settlement Report: ID={}, Total={:.2f}".format(records[0]["id"], total)
     
     end = time.time()
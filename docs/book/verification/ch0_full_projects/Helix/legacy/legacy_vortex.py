@@ -1,5 +1,7 @@
 # legacy_vortex.py
 import json, math, hashlib, time
+import numpy as np
+from legacy_kernels import compound_vortex
 
 def parse_and_clean(raw_json):
     # Targets GO (json.loads, join)
@@ -22,13 +24,23 @@ def format_output(id_val, result):
     # Targets RUBY (format)
     return "ID: {:04d} | Result: {:.4f}".format(int(id_val), result)
 
+def _row_val(item):
+    # np.fromiter would coerce "10" and null; heavy_calculation's math.pow
+    # rejected them, so malformed rows still raise the same TypeError
+    val = item[1]
+    if not isinstance(val, (int, float)):
+        raise TypeError(f"must be real number, not {type(val).__name__}")
+    return val
+
 def process_vortex(raw_input):
     # Entry point for validator
     data = json.loads(raw_input) # List of [id, val]
-    total = 0.0
-    for item in data:
-        h = heavy_calculation(item[1])
-        total += h
+    vals = np.fromiter((_row_val(item) for item in data), dtype=np.float64, count=len(data))
+    # math.pow(val, 2) raised OverflowError where a finite val squares to inf
+    with np.errstate(over='ignore'):
+        if np.any(np.isinf(vals * vals) & np.isfinite(vals)):
+            raise OverflowError("math range error")
+    _, total = compound_vortex(vals)
     
     return {
         "total_value": total,
@@ -1,47 +1,123 @@
 # Vigilant/analyst/entropy_engine.py
 # PHASE 2 (v3.0): RESILIENT SWARM ANALYST
-# Features: Threaded Concurrency, Watchdog Heartbeat
+# Features: Async Event Loop, Watchdog Heartbeat
 
-import socketserver
+import asyncio
+import contextlib
+import functools
 import os
-import math
 import json
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
-class AnalystHandler(socketserver.BaseRequestHandler):
-    def handle(self):
+import numpy as np
+
+# log2(c) for c in 1..65535: per-symbol terms become a table load instead of
+# a transcendental call. Larger counts fall back to np.log2.
+LOG2 = np.log2(np.arange(1, 1 << 16, dtype=np.float64))
+
+def _char_entropy(s):
+    # Shannon entropy over code points, for tokens the byte histogram can't score
+    counts = np.fromiter(Counter(s).values(), dtype=np.int64)
+    lg = LOG2[counts - 1] if counts.max() <= LOG2.shape[0] else np.log2(counts)
+    return float((counts * (np.log2(len(s)) - lg)).sum() / len(s))
+
+def _batch_entropy(tokens):
+    # Entropy of every ASCII token at once from a (n, 256) byte count matrix.
+    # Bytes equal characters only for ASCII; other tokens are scored per code
+    # point so multi-byte characters are not split into their UTF-8 bytes.
+    ents = np.empty(len(tokens), dtype=np.float64)
+    ascii_idx = []
+    for i, t in enumerate(tokens):
+        if t.isascii(): ascii_idx.append(i)
+        else: ents[i] = _char_entropy(t)
+    if not ascii_idx: return ents
+    bufs = [tokens[i].encode('ascii') for i in ascii_idx]
+    lens = np.fromiter(map(len, bufs), dtype=np.int64, count=len(bufs))
+    rows = np.repeat(np.arange(len(bufs), dtype=np.int64), lens)
+    data = np.frombuffer(b"".join(bufs), dtype=np.uint8)
+    counts = np.bincount(rows * 256 + data, minlength=len(bufs) * 256).reshape(-1, 256)
+    # Empty bins read log2(1) = 0 and are zeroed by their count anyway
+    nz = np.maximum(counts, 1)
+    lg = LOG2[nz - 1] if nz.max() <= LOG2.shape[0] else np.log2(nz)
+    ents[ascii_idx] = (counts * (np.log2(lens)[:, None] - lg)).sum(axis=1) / lens
+    return ents
+
+# Punctuation trimmed from token edges. Only the ends are stripped: removing
+# these characters mid-token (str.translate) would merge or alter tokens.
+_STRIP_CHARS = '"\',:;()[]{}'
+
+def analyze(text):
+    longs = [w for w in (word.strip(_STRIP_CHARS) for word in text.split()) if len(w) > 20]
+    if not longs: return []
+    ents = _batch_entropy(longs)
+    return [{"type": "SEC_HIGH_ENTROPY", "score": round(float(ent), 2)} for ent in ents[ents > 3.8]]
+
+async def handle(reader, writer, state=None):
+    try:
+        data = await reader.read(1024*128)
+        if not data: return
+        
+        # Watchdog Heartbeat (matched on raw bytes, no decode)
+        if data == b"PING":
+            writer.write(b"PONG")
+            await writer.drain()
+            return
+
+        # CPU-bound scan runs off the event loop so pings stay responsive
+        loop = asyncio.get_running_loop()
+        text = data.decode('utf-8', 'replace')
+        pool = state["pool"] if state else None
         try:
-            data = self.request.recv(1024*128).decode('utf-8')
-            if not data: return
-            
-            # Watchdog Heartbeat
-            if data == "PING":
-                self.request.sendall(b"PONG")
-                return
-
-            findings = self.analyze(data)
-            self.request.sendall(json.dumps(findings).encode('utf-8'))
-        except Exception as e:
-            print(f"[ANALYST ERROR] {e}")
-
-    def calculate_entropy(self, s):
-        if not s: return 0
-        prob = [float(s.count(c)) / len(s) for c in dict.fromkeys(list(s))]
-        return - sum([p * math.log(p, 2) for p in prob])
-
-    def analyze(self, text):
-        findings = []
-        for word in text.split():
-            clean = word.strip('"\',:;()[]{}')
-            if len(clean) > 20:
-                ent = self.calculate_entropy(clean)
-                if ent > 3.8:
-                    findings.append({"type": "SEC_HIGH_ENTROPY", "score": round(ent, 2)})
-        return findings
+            findings = await loop.run_in_executor(pool, analyze, text)
+        except BrokenProcessPool:
+            # A worker died (OOM, SIGKILL) and the pool can't take new work.
+            # Rescan on the loop's thread pool instead of answering with an
+            # empty body, which the gateway would read as zero findings.
+            # Not rebuilt here: workers forked now would inherit open client
+            # sockets (see _make_pool).
+            if state["pool"] is pool:
+                print("[ANALYST ERROR] worker pool broken, falling back to threads")
+                state["pool"] = None
+                pool.shutdown(wait=False)
+            findings = await loop.run_in_executor(None, analyze, text)
+        writer.write(json.dumps(findings).encode('utf-8'))
+        await writer.drain()
+    except Exception as e:
+        print(f"[ANALYST ERROR] {e}")
+    finally:
+        writer.close()
+        # A client that reset mid-reply surfaces here, outside the except above
+        with contextlib.suppress(ConnectionError):
+            await writer.wait_closed()
+
+def _make_pool():
+    # Worker processes sidestep the GIL; platforms without working process
+    # semaphores (e.g. Android/Termux), or whose workers die on start-up, fall
+    # back to the loop's thread pool.
+    # Workers are forked up front: forked lazily on the first request they
+    # would inherit that client's socket and hold its EOF back.
+    try:
+        pool = ProcessPoolExecutor()
+        pool.submit(analyze, "").result()
+        return pool
+    except (ImportError, NotImplementedError, OSError, BrokenProcessPool):
+        return None
+
+async def serve(path):
+    # Shared by every connection so a broken pool is swapped out only once
+    state = {"pool": _make_pool()}
+    try:
+        server = await asyncio.start_unix_server(functools.partial(handle, state=state), path=path)
+        async with server:
+            await server.serve_forever()
+    finally:
+        if state["pool"] is not None: state["pool"].shutdown()
 
 SOCKET_PATH = "/data/data/com.termux/files/usr/tmp/v_a.sock"
 
 if __name__ == "__main__":
     if os.path.exists(SOCKET_PATH): os.remove(SOCKET_PATH)
     
-    with socketserver.ThreadingUnixStreamServer(SOCKET_PATH, AnalystHandler) as server:
-        server.serve_forever()
+    asyncio.run(serve(SOCKET_PATH))
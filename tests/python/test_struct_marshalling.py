@@ -1,33 +1,31 @@
-#!/usr/bin/env python3
 """
 Python Struct Marshalling Tests
 Week 5, Task 42 - Test struct ↔ Python object conversion
 
 Tests the cross-language bridge's ability to marshal NAAb structs to/from Python objects.
+
+Run with: pytest tests/python/test_struct_marshalling.py
+
+The whole module is skipped when the naab_python extension is not built. It
+needs pybind11 bindings that:
+  1. Expose naab_python.eval(code: str) -> Any
+  2. Expose naab_python.call_with_struct(fn: str, obj: Any, type: str) -> Any
+  3. Use CrossLanguageBridge for struct marshalling
 """
 
 import sys
 import os
 
+import pytest
+
 # Add build directory to path to import C++ extension module
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../build'))
 
-try:
-    import naab_python  # C++ extension module (requires pybind11 bindings)
-    NAAB_PYTHON_AVAILABLE = True
-except ImportError as e:
-    print(f"⚠️  naab_python module not available: {e}")
-    print("   This is expected if pybind11 bindings haven't been created yet.")
-    print("   Skipping tests...")
-    NAAB_PYTHON_AVAILABLE = False
+naab_python = pytest.importorskip("naab_python")  # C++ extension module (requires pybind11 bindings)
 
 
 def test_struct_to_python():
     """Test NAAb struct → Python object conversion"""
-    if not NAAB_PYTHON_AVAILABLE:
-        print("⊘ test_struct_to_python SKIPPED (module unavailable)")
-        return
-
     print("Running test_struct_to_python...")
 
     # Evaluate NAAb code that creates a struct
@@ -57,10 +55,6 @@ def test_struct_to_python():
 
 def test_python_to_struct():
     """Test Python object → NAAb struct conversion"""
-    if not NAAB_PYTHON_AVAILABLE:
-        print("⊘ test_python_to_struct SKIPPED (module unavailable)")
-        return
-
     print("Running test_python_to_struct...")
 
     # Create Python object with struct-like attributes
@@ -87,10 +81,6 @@ def test_python_to_struct():
 
 def test_nested_struct_marshalling():
     """Test nested structs (struct containing another struct)"""
-    if not NAAB_PYTHON_AVAILABLE:
-        print("⊘ test_nested_struct_marshalling SKIPPED (module unavailable)")
-        return
-
     print("Running test_nested_struct_marshalling...")
 
     result = naab_python.eval("""
@@ -127,10 +117,6 @@ def test_nested_struct_marshalling():
 
 def test_struct_array_marshalling():
     """Test array of structs"""
-    if not NAAB_PYTHON_AVAILABLE:
-        print("⊘ test_struct_array_marshalling SKIPPED (module unavailable)")
-        return
-
     print("Running test_struct_array_marshalling...")
 
     result = naab_python.eval("""
@@ -150,63 +136,13 @@ def test_struct_array_marshalling():
     assert isinstance(result, list), f"Expected list, got {type(result)}"
     assert len(result) == 3, f"Expected 3 elements, got {len(result)}"
 
-    # Verify each element is a Point
-    for i, point in enumerate(result):
-        assert hasattr(point, 'x'), f"Element {i} should have 'x'"
-        assert hasattr(point, 'y'), f"Element {i} should have 'y'"
-
-    assert result[0].x == 1 and result[0].y == 2
-    assert result[1].x == 3 and result[1].y == 4
-    assert result[2].x == 5 and result[2].y == 6
+    # Verify each element is a Point (a missing field raises AttributeError)
+    xs = [p.x for p in result]
+    ys = [p.y for p in result]
+    assert xs == [1, 3, 5], f"Expected x values [1, 3, 5], got {xs}"
+    assert ys == [2, 4, 6], f"Expected y values [2, 4, 6], got {ys}"
 
     print("✓ Struct array marshalling works")
     print(f"  Array length: {len(result)}")
     for i, p in enumerate(result):
         print(f"  result[{i}] = Point(x={p.x}, y={p.y})")
-
-
-if __name__ == "__main__":
-    print("=" * 60)
-    print("Python Struct Marshalling Tests")
-    print("Week 5, Task 42")
-    print("=" * 60)
-    print()
-
-    if not NAAB_PYTHON_AVAILABLE:
-        print("⚠️  Tests cannot run: naab_python module not available")
-        print()
-        print("To enable these tests, create pybind11 bindings that:")
-        print("  1. Expose naab_python.eval(code: str) -> Any")
-        print("  2. Expose naab_python.call_with_struct(fn: str, obj: Any, type: str) -> Any")
-        print("  3. Use CrossLanguageBridge for struct marshalling")
-        print()
-        sys.exit(0)
-
-    try:
-        test_struct_to_python()
-        print()
-        test_python_to_struct()
-        print()
-        test_nested_struct_marshalling()
-        print()
-        test_struct_array_marshalling()
-        print()
-        print("=" * 60)
-        print("All Python struct marshalling tests passed! ✓")
-        print("=" * 60)
-
-    except AssertionError as e:
-        print()
-        print("=" * 60)
-        print(f"✗ Test FAILED: {e}")
-        print("=" * 60)
-        sys.exit(1)
-
-    except Exception as e:
-        print()
-        print("=" * 60)
-        print(f"✗ Test ERROR: {e}")
-        import traceback
-        traceback.print_exc()
-        print("=" * 60)
-        sys.exit(1)